@@ -2732,6 +2732,124 @@ int libqcow_file_get_offset(
 	return( 1 );
 }
 
+/* Flushes the cached (media) data
+ * This empties the level 2 table and cluster block caches, cached data
+ * is read again from the file IO handle when needed
+ * Returns 1 if successful or -1 on error
+ */
+int libqcow_file_flush_cache(
+     libqcow_file_t *file,
+     libcerror_error_t **error )
+{
+	libqcow_internal_file_t *internal_file = NULL;
+	static char *function                  = "libqcow_file_flush_cache";
+	int result                             = 1;
+
+	if( file == NULL )
+	{
+		libcerror_error_set(
+		 error,
+		 LIBCERROR_ERROR_DOMAIN_ARGUMENTS,
+		 LIBCERROR_ARGUMENT_ERROR_INVALID_VALUE,
+		 "%s: invalid file.",
+		 function );
+
+		return( -1 );
+	}
+	internal_file = (libqcow_internal_file_t *) file;
+
+	if( internal_file->file_io_handle == NULL )
+	{
+		libcerror_error_set(
+		 error,
+		 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+		 LIBCERROR_RUNTIME_ERROR_VALUE_MISSING,
+		 "%s: invalid file - missing file IO handle.",
+		 function );
+
+		return( -1 );
+	}
+#if defined( HAVE_LIBQCOW_MULTI_THREAD_SUPPORT )
+	if( libcthreads_read_write_lock_grab_for_write(
+	     internal_file->read_write_lock,
+	     error ) != 1 )
+	{
+		libcerror_error_set(
+		 error,
+		 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+		 LIBCERROR_RUNTIME_ERROR_SET_FAILED,
+		 "%s: unable to grab read/write lock for writing.",
+		 function );
+
+		return( -1 );
+	}
+#endif
+	if( internal_file->level2_table_cache != NULL )
+	{
+		if( libfcache_cache_clear(
+		     internal_file->level2_table_cache,
+		     error ) != 1 )
+		{
+			libcerror_error_set(
+			 error,
+			 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+			 LIBCERROR_RUNTIME_ERROR_FINALIZE_FAILED,
+			 "%s: unable to clear level2 table cache.",
+			 function );
+
+			result = -1;
+		}
+	}
+	if( internal_file->cluster_block_cache != NULL )
+	{
+		if( libfcache_cache_clear(
+		     internal_file->cluster_block_cache,
+		     error ) != 1 )
+		{
+			libcerror_error_set(
+			 error,
+			 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+			 LIBCERROR_RUNTIME_ERROR_FINALIZE_FAILED,
+			 "%s: unable to clear cluster block cache.",
+			 function );
+
+			result = -1;
+		}
+	}
+	if( internal_file->compressed_cluster_block_cache != NULL )
+	{
+		if( libfcache_cache_clear(
+		     internal_file->compressed_cluster_block_cache,
+		     error ) != 1 )
+		{
+			libcerror_error_set(
+			 error,
+			 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+			 LIBCERROR_RUNTIME_ERROR_FINALIZE_FAILED,
+			 "%s: unable to clear compressed cluster block cache.",
+			 function );
+
+			result = -1;
+		}
+	}
+#if defined( HAVE_LIBQCOW_MULTI_THREAD_SUPPORT )
+	if( libcthreads_read_write_lock_release_for_write(
+	     internal_file->read_write_lock,
+	     error ) != 1 )
+	{
+		libcerror_error_set(
+		 error,
+		 LIBCERROR_ERROR_DOMAIN_RUNTIME,
+		 LIBCERROR_RUNTIME_ERROR_SET_FAILED,
+		 "%s: unable to release read/write lock for writing.",
+		 function );
+
+		return( -1 );
+	}
+#endif
+	return( result );
+}
+
 /* Set the keys
  * This function needs to be used before one of the open functions
  * Returns 1 if successful or -1 on error
@@ -235,6 +235,11 @@ int libqcow_file_get_offset(
      off64_t *offset,
      libcerror_error_t **error );
 
+LIBQCOW_EXTERN \
+int libqcow_file_flush_cache(
+     libqcow_file_t *file,
+     libcerror_error_t **error );
+
 LIBQCOW_EXTERN \
 int libqcow_file_set_keys(
      libqcow_file_t *file,
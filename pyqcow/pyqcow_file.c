@@ -38,6 +38,10 @@
 #include "pyqcow_unused.h"
 #include "pyqcow_file.h"
 
+/* The size of the buffer used to consume a range of data
+ */
+#define PYQCOW_FILE_CONSUME_BUFFER_SIZE		( 1024 * 1024 )
+
 #if !defined( LIBQCOW_HAVE_BFIO )
 LIBQCOW_EXTERN \
 int libqcow_file_open_file_io_handle(
@@ -86,6 +90,13 @@ PyMethodDef pyqcow_file_object_methods[] = {
 	  "\n"
 	  "Reads a buffer of data." },
 
+	{ "read_buffer_into",
+	  (PyCFunction) pyqcow_file_read_buffer_into,
+	  METH_VARARGS | METH_KEYWORDS,
+	  "read_buffer_into(buffer) -> Integer\n"
+	  "\n"
+	  "Reads data into a writable buffer and returns the number of bytes read." },
+
 	{ "read_buffer_at_offset",
 	  (PyCFunction) pyqcow_file_read_buffer_at_offset,
 	  METH_VARARGS | METH_KEYWORDS,
@@ -93,6 +104,30 @@ PyMethodDef pyqcow_file_object_methods[] = {
 	  "\n"
 	  "Reads a buffer of data at a specific offset." },
 
+	{ "read_buffer_at_offset_into",
+	  (PyCFunction) pyqcow_file_read_buffer_at_offset_into,
+	  METH_VARARGS | METH_KEYWORDS,
+	  "read_buffer_at_offset_into(buffer, offset) -> Integer\n"
+	  "\n"
+	  "Reads data at a specific offset into a writable buffer and returns the\n"
+	  "number of bytes read." },
+
+	{ "read_buffers_at_offsets",
+	  (PyCFunction) pyqcow_file_read_buffers_at_offsets,
+	  METH_VARARGS | METH_KEYWORDS,
+	  "read_buffers_at_offsets(sizes, offsets) -> List of Strings\n"
+	  "\n"
+	  "Reads multiple buffers of data at specific offsets." },
+
+	{ "consume_range",
+	  (PyCFunction) pyqcow_file_consume_range,
+	  METH_VARARGS | METH_KEYWORDS,
+	  "consume_range(offset, size) -> Integer\n"
+	  "\n"
+	  "Reads a range of data at a specific offset, without returning the data,\n"
+	  "and returns the number of bytes read. If offset is None the data is read\n"
+	  "from the current offset." },
+
 	{ "seek_offset",
 	  (PyCFunction) pyqcow_file_seek_offset,
 	  METH_VARARGS | METH_KEYWORDS,
@@ -107,6 +142,13 @@ PyMethodDef pyqcow_file_object_methods[] = {
 	  "\n"
 	  "Retrieved the current offset within the data." },
 
+	{ "flush_cache",
+	  (PyCFunction) pyqcow_file_flush_cache,
+	  METH_NOARGS,
+	  "flush_cache() -> None\n"
+	  "\n"
+	  "Flushes the cached data, cached data is read again when needed." },
+
 	/* Some Pythonesque aliases */
 
 	{ "read",
@@ -116,6 +158,13 @@ PyMethodDef pyqcow_file_object_methods[] = {
 	  "\n"
 	  "Reads a buffer of data." },
 
+	{ "readinto",
+	  (PyCFunction) pyqcow_file_read_buffer_into,
+	  METH_VARARGS | METH_KEYWORDS,
+	  "readinto(buffer) -> Integer\n"
+	  "\n"
+	  "Reads data into a writable buffer and returns the number of bytes read." },
+
 	{ "seek",
 	  (PyCFunction) pyqcow_file_seek_offset,
 	  METH_VARARGS | METH_KEYWORDS,
@@ -997,6 +1046,80 @@ PyObject *pyqcow_file_read_buffer(
 	return( string_object );
 }
 
+/* Reads data at the current offset into a writable buffer object
+ * Returns a Python object if successful or NULL on error
+ */
+PyObject *pyqcow_file_read_buffer_into(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords )
+{
+	Py_buffer buffer_view;
+
+	libcerror_error_t *error    = NULL;
+	PyObject *buffer_object     = NULL;
+	PyObject *integer_object    = NULL;
+	static char *function       = "pyqcow_file_read_buffer_into";
+	static char *keyword_list[] = { "buffer", NULL };
+	ssize_t read_count          = 0;
+
+	if( pyqcow_file == NULL )
+	{
+		PyErr_Format(
+		 PyExc_TypeError,
+		 "%s: invalid file.",
+		 function );
+
+		return( NULL );
+	}
+	if( PyArg_ParseTupleAndKeywords(
+	     arguments,
+	     keywords,
+	     "O",
+	     keyword_list,
+	     &buffer_object ) == 0 )
+	{
+		return( NULL );
+	}
+	if( PyObject_GetBuffer(
+	     buffer_object,
+	     &buffer_view,
+	     PyBUF_WRITABLE ) != 0 )
+	{
+		return( NULL );
+	}
+	Py_BEGIN_ALLOW_THREADS
+
+	read_count = libqcow_file_read_buffer(
+	              pyqcow_file->file,
+	              (uint8_t *) buffer_view.buf,
+	              (size_t) buffer_view.len,
+	              &error );
+
+	Py_END_ALLOW_THREADS
+
+	PyBuffer_Release(
+	 &buffer_view );
+
+	if( read_count <= -1 )
+	{
+		pyqcow_error_raise(
+		 error,
+		 PyExc_IOError,
+		 "%s: unable to read data.",
+		 function );
+
+		libcerror_error_free(
+		 &error );
+
+		return( NULL );
+	}
+	integer_object = pyqcow_integer_signed_new_from_64bit(
+	                  (int64_t) read_count );
+
+	return( integer_object );
+}
+
 /* Reads data at a specific offset
  * Returns a Python object if successful or NULL on error
  */
@@ -1126,6 +1249,629 @@ PyObject *pyqcow_file_read_buffer_at_offset(
 	return( string_object );
 }
 
+/* Reads data at a specific offset into a writable buffer object
+ * Returns a Python object if successful or NULL on error
+ */
+PyObject *pyqcow_file_read_buffer_at_offset_into(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords )
+{
+	Py_buffer buffer_view;
+
+	libcerror_error_t *error    = NULL;
+	PyObject *buffer_object     = NULL;
+	PyObject *integer_object    = NULL;
+	static char *function       = "pyqcow_file_read_buffer_at_offset_into";
+	static char *keyword_list[] = { "buffer", "offset", NULL };
+	off64_t read_offset         = 0;
+	ssize_t read_count          = 0;
+
+	if( pyqcow_file == NULL )
+	{
+		PyErr_Format(
+		 PyExc_TypeError,
+		 "%s: invalid file.",
+		 function );
+
+		return( NULL );
+	}
+	if( PyArg_ParseTupleAndKeywords(
+	     arguments,
+	     keywords,
+	     "O|L",
+	     keyword_list,
+	     &buffer_object,
+	     &read_offset ) == 0 )
+	{
+		return( NULL );
+	}
+	if( read_offset < 0 )
+	{
+		PyErr_Format(
+		 PyExc_ValueError,
+		 "%s: invalid argument read offset value less than zero.",
+		 function );
+
+		return( NULL );
+	}
+	if( PyObject_GetBuffer(
+	     buffer_object,
+	     &buffer_view,
+	     PyBUF_WRITABLE ) != 0 )
+	{
+		return( NULL );
+	}
+	Py_BEGIN_ALLOW_THREADS
+
+	read_count = libqcow_file_read_buffer_at_offset(
+	              pyqcow_file->file,
+	              (uint8_t *) buffer_view.buf,
+	              (size_t) buffer_view.len,
+	              (off64_t) read_offset,
+	              &error );
+
+	Py_END_ALLOW_THREADS
+
+	PyBuffer_Release(
+	 &buffer_view );
+
+	if( read_count <= -1 )
+	{
+		pyqcow_error_raise(
+		 error,
+		 PyExc_IOError,
+		 "%s: unable to read data.",
+		 function );
+
+		libcerror_error_free(
+		 &error );
+
+		return( NULL );
+	}
+	integer_object = pyqcow_integer_signed_new_from_64bit(
+	                  (int64_t) read_count );
+
+	return( integer_object );
+}
+
+/* Reads multiple buffers of data at specific offsets
+ * Returns a Python object if successful or NULL on error
+ */
+PyObject *pyqcow_file_read_buffers_at_offsets(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords )
+{
+	libcerror_error_t *error     = NULL;
+	PyObject **string_objects    = NULL;
+	PyObject *list_object        = NULL;
+	PyObject *offsets_object     = NULL;
+	PyObject *offsets_sequence   = NULL;
+	PyObject *sizes_object       = NULL;
+	PyObject *sizes_sequence     = NULL;
+	static char *function        = "pyqcow_file_read_buffers_at_offsets";
+	static char *keyword_list[]  = { "sizes", "offsets", NULL };
+	uint8_t **buffers            = NULL;
+	off64_t *read_offsets        = NULL;
+	size_t *read_sizes           = NULL;
+	ssize_t read_count           = 0;
+	int64_t value_64bit          = 0;
+	Py_ssize_t buffer_index      = 0;
+	Py_ssize_t number_of_buffers = 0;
+
+	if( pyqcow_file == NULL )
+	{
+		PyErr_Format(
+		 PyExc_TypeError,
+		 "%s: invalid file.",
+		 function );
+
+		return( NULL );
+	}
+	if( PyArg_ParseTupleAndKeywords(
+	     arguments,
+	     keywords,
+	     "OO",
+	     keyword_list,
+	     &sizes_object,
+	     &offsets_object ) == 0 )
+	{
+		return( NULL );
+	}
+	sizes_sequence = PySequence_Fast(
+	                  sizes_object,
+	                  "invalid argument sizes value not a sequence." );
+
+	if( sizes_sequence == NULL )
+	{
+		goto on_error;
+	}
+	offsets_sequence = PySequence_Fast(
+	                    offsets_object,
+	                    "invalid argument offsets value not a sequence." );
+
+	if( offsets_sequence == NULL )
+	{
+		goto on_error;
+	}
+	number_of_buffers = PySequence_Fast_GET_SIZE(
+	                     sizes_sequence );
+
+	if( number_of_buffers != PySequence_Fast_GET_SIZE( offsets_sequence ) )
+	{
+		PyErr_Format(
+		 PyExc_ValueError,
+		 "%s: invalid argument number of sizes value does not match number of offsets.",
+		 function );
+
+		goto on_error;
+	}
+	list_object = PyList_New(
+	               number_of_buffers );
+
+	if( list_object == NULL )
+	{
+		goto on_error;
+	}
+	if( number_of_buffers == 0 )
+	{
+		Py_DecRef(
+		 offsets_sequence );
+
+		Py_DecRef(
+		 sizes_sequence );
+
+		return( list_object );
+	}
+	string_objects = (PyObject **) PyMem_Malloc(
+	                                sizeof( PyObject * ) * number_of_buffers );
+
+	if( string_objects == NULL )
+	{
+		PyErr_Format(
+		 PyExc_MemoryError,
+		 "%s: unable to create string objects.",
+		 function );
+
+		goto on_error;
+	}
+	/* Make sure the string objects are set before on_error can free them
+	 */
+	for( buffer_index = 0;
+	     buffer_index < number_of_buffers;
+	     buffer_index++ )
+	{
+		string_objects[ buffer_index ] = NULL;
+	}
+	buffers = (uint8_t **) PyMem_Malloc(
+	                        sizeof( uint8_t * ) * number_of_buffers );
+
+	if( buffers == NULL )
+	{
+		PyErr_Format(
+		 PyExc_MemoryError,
+		 "%s: unable to create buffers.",
+		 function );
+
+		goto on_error;
+	}
+	read_offsets = (off64_t *) PyMem_Malloc(
+	                            sizeof( off64_t ) * number_of_buffers );
+
+	if( read_offsets == NULL )
+	{
+		PyErr_Format(
+		 PyExc_MemoryError,
+		 "%s: unable to create read offsets.",
+		 function );
+
+		goto on_error;
+	}
+	read_sizes = (size_t *) PyMem_Malloc(
+	                         sizeof( size_t ) * number_of_buffers );
+
+	if( read_sizes == NULL )
+	{
+		PyErr_Format(
+		 PyExc_MemoryError,
+		 "%s: unable to create read sizes.",
+		 function );
+
+		goto on_error;
+	}
+	for( buffer_index = 0;
+	     buffer_index < number_of_buffers;
+	     buffer_index++ )
+	{
+		if( pyqcow_integer_signed_copy_to_64bit(
+		     PySequence_Fast_GET_ITEM( sizes_sequence, buffer_index ),
+		     &value_64bit,
+		     &error ) != 1 )
+		{
+			pyqcow_error_raise(
+			 error,
+			 PyExc_TypeError,
+			 "%s: unable to convert size: %" PRIi64 " into 64-bit value.",
+			 function,
+			 (int64_t) buffer_index );
+
+			libcerror_error_free(
+			 &error );
+
+			goto on_error;
+		}
+		if( value_64bit < 0 )
+		{
+			PyErr_Format(
+			 PyExc_ValueError,
+			 "%s: invalid argument read size: %zd value less than zero.",
+			 function,
+			 buffer_index );
+
+			goto on_error;
+		}
+		/* Make sure the data fits into the memory buffer
+		 */
+		if( value_64bit > (int64_t) INT_MAX )
+		{
+			PyErr_Format(
+			 PyExc_ValueError,
+			 "%s: invalid argument read size: %zd value exceeds maximum.",
+			 function,
+			 buffer_index );
+
+			goto on_error;
+		}
+		read_sizes[ buffer_index ] = (size_t) value_64bit;
+
+		if( pyqcow_integer_signed_copy_to_64bit(
+		     PySequence_Fast_GET_ITEM( offsets_sequence, buffer_index ),
+		     &value_64bit,
+		     &error ) != 1 )
+		{
+			pyqcow_error_raise(
+			 error,
+			 PyExc_TypeError,
+			 "%s: unable to convert offset: %" PRIi64 " into 64-bit value.",
+			 function,
+			 (int64_t) buffer_index );
+
+			libcerror_error_free(
+			 &error );
+
+			goto on_error;
+		}
+		if( value_64bit < 0 )
+		{
+			PyErr_Format(
+			 PyExc_ValueError,
+			 "%s: invalid argument read offset: %zd value less than zero.",
+			 function,
+			 buffer_index );
+
+			goto on_error;
+		}
+		read_offsets[ buffer_index ] = (off64_t) value_64bit;
+
+#if PY_MAJOR_VERSION >= 3
+		string_objects[ buffer_index ] = PyBytes_FromStringAndSize(
+		                                  NULL,
+		                                  (Py_ssize_t) read_sizes[ buffer_index ] );
+#else
+		string_objects[ buffer_index ] = PyString_FromStringAndSize(
+		                                  NULL,
+		                                  (Py_ssize_t) read_sizes[ buffer_index ] );
+#endif
+		if( string_objects[ buffer_index ] == NULL )
+		{
+			goto on_error;
+		}
+#if PY_MAJOR_VERSION >= 3
+		buffers[ buffer_index ] = (uint8_t *) PyBytes_AsString(
+		                                       string_objects[ buffer_index ] );
+#else
+		buffers[ buffer_index ] = (uint8_t *) PyString_AsString(
+		                                       string_objects[ buffer_index ] );
+#endif
+	}
+	/* Read all the buffers without holding the GIL in between reads
+	 */
+	Py_BEGIN_ALLOW_THREADS
+
+	for( buffer_index = 0;
+	     buffer_index < number_of_buffers;
+	     buffer_index++ )
+	{
+		read_count = libqcow_file_read_buffer_at_offset(
+		              pyqcow_file->file,
+		              buffers[ buffer_index ],
+		              read_sizes[ buffer_index ],
+		              read_offsets[ buffer_index ],
+		              &error );
+
+		if( read_count <= -1 )
+		{
+			break;
+		}
+		read_sizes[ buffer_index ] = (size_t) read_count;
+	}
+	Py_END_ALLOW_THREADS
+
+	if( read_count <= -1 )
+	{
+		pyqcow_error_raise(
+		 error,
+		 PyExc_IOError,
+		 "%s: unable to read data at offset: %" PRIi64 ".",
+		 function,
+		 (int64_t) read_offsets[ buffer_index ] );
+
+		libcerror_error_free(
+		 &error );
+
+		goto on_error;
+	}
+	for( buffer_index = 0;
+	     buffer_index < number_of_buffers;
+	     buffer_index++ )
+	{
+		/* Need to resize the string here in case read_size was not fully read.
+		 */
+#if PY_MAJOR_VERSION >= 3
+		if( _PyBytes_Resize(
+		     &( string_objects[ buffer_index ] ),
+		     (Py_ssize_t) read_sizes[ buffer_index ] ) != 0 )
+#else
+		if( _PyString_Resize(
+		     &( string_objects[ buffer_index ] ),
+		     (Py_ssize_t) read_sizes[ buffer_index ] ) != 0 )
+#endif
+		{
+			goto on_error;
+		}
+		/* PyList_SET_ITEM steals the reference to the string object
+		 */
+		PyList_SET_ITEM(
+		 list_object,
+		 buffer_index,
+		 string_objects[ buffer_index ] );
+
+		string_objects[ buffer_index ] = NULL;
+	}
+	PyMem_Free(
+	 read_sizes );
+
+	PyMem_Free(
+	 read_offsets );
+
+	PyMem_Free(
+	 buffers );
+
+	PyMem_Free(
+	 string_objects );
+
+	Py_DecRef(
+	 offsets_sequence );
+
+	Py_DecRef(
+	 sizes_sequence );
+
+	return( list_object );
+
+on_error:
+	if( string_objects != NULL )
+	{
+		for( buffer_index = 0;
+		     buffer_index < number_of_buffers;
+		     buffer_index++ )
+		{
+			if( string_objects[ buffer_index ] != NULL )
+			{
+				Py_DecRef(
+				 string_objects[ buffer_index ] );
+			}
+		}
+		PyMem_Free(
+		 string_objects );
+	}
+	if( read_sizes != NULL )
+	{
+		PyMem_Free(
+		 read_sizes );
+	}
+	if( read_offsets != NULL )
+	{
+		PyMem_Free(
+		 read_offsets );
+	}
+	if( buffers != NULL )
+	{
+		PyMem_Free(
+		 buffers );
+	}
+	if( list_object != NULL )
+	{
+		Py_DecRef(
+		 list_object );
+	}
+	if( offsets_sequence != NULL )
+	{
+		Py_DecRef(
+		 offsets_sequence );
+	}
+	if( sizes_sequence != NULL )
+	{
+		Py_DecRef(
+		 sizes_sequence );
+	}
+	return( NULL );
+}
+
+/* Reads a range of data at a specific or the current offset and discards the data
+ * Returns a Python object if successful or NULL on error
+ */
+PyObject *pyqcow_file_consume_range(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords )
+{
+	libcerror_error_t *error    = NULL;
+	PyObject *integer_object    = NULL;
+	PyObject *offset_object     = NULL;
+	static char *function       = "pyqcow_file_consume_range";
+	static char *keyword_list[] = { "offset", "size", NULL };
+	uint8_t *buffer             = NULL;
+	off64_t range_offset        = -1;
+	size64_t range_size         = 0;
+	size64_t total_read_count   = 0;
+	size_t read_size            = 0;
+	ssize_t read_count          = 0;
+	int64_t size                = 0;
+	int64_t value_64bit         = 0;
+
+	if( pyqcow_file == NULL )
+	{
+		PyErr_Format(
+		 PyExc_TypeError,
+		 "%s: invalid file.",
+		 function );
+
+		return( NULL );
+	}
+	if( PyArg_ParseTupleAndKeywords(
+	     arguments,
+	     keywords,
+	     "OL",
+	     keyword_list,
+	     &offset_object,
+	     &size ) == 0 )
+	{
+		return( NULL );
+	}
+	/* An offset of None indicates to read from the current offset
+	 */
+	if( offset_object != Py_None )
+	{
+		if( pyqcow_integer_signed_copy_to_64bit(
+		     offset_object,
+		     &value_64bit,
+		     &error ) != 1 )
+		{
+			pyqcow_error_raise(
+			 error,
+			 PyExc_TypeError,
+			 "%s: unable to convert offset into 64-bit value.",
+			 function );
+
+			libcerror_error_free(
+			 &error );
+
+			return( NULL );
+		}
+		if( value_64bit < 0 )
+		{
+			PyErr_Format(
+			 PyExc_ValueError,
+			 "%s: invalid argument offset value less than zero.",
+			 function );
+
+			return( NULL );
+		}
+		range_offset = (off64_t) value_64bit;
+	}
+	if( size < 0 )
+	{
+		PyErr_Format(
+		 PyExc_ValueError,
+		 "%s: invalid argument size value less than zero.",
+		 function );
+
+		return( NULL );
+	}
+	range_size = (size64_t) size;
+
+	buffer = (uint8_t *) PyMem_Malloc(
+	                      sizeof( uint8_t ) * PYQCOW_FILE_CONSUME_BUFFER_SIZE );
+
+	if( buffer == NULL )
+	{
+		PyErr_Format(
+		 PyExc_MemoryError,
+		 "%s: unable to create buffer.",
+		 function );
+
+		return( NULL );
+	}
+	Py_BEGIN_ALLOW_THREADS
+
+	while( range_size > 0 )
+	{
+		read_size = PYQCOW_FILE_CONSUME_BUFFER_SIZE;
+
+		if( range_size < (size64_t) read_size )
+		{
+			read_size = (size_t) range_size;
+		}
+		if( range_offset == -1 )
+		{
+			read_count = libqcow_file_read_buffer(
+			              pyqcow_file->file,
+			              buffer,
+			              read_size,
+			              &error );
+		}
+		else
+		{
+			read_count = libqcow_file_read_buffer_at_offset(
+			              pyqcow_file->file,
+			              buffer,
+			              read_size,
+			              range_offset,
+			              &error );
+		}
+		if( read_count <= -1 )
+		{
+			break;
+		}
+		if( range_offset != -1 )
+		{
+			range_offset += (off64_t) read_count;
+		}
+		range_size       -= (size64_t) read_count;
+		total_read_count += (size64_t) read_count;
+
+		/* A short read indicates the end of the data
+		 */
+		if( (size_t) read_count != read_size )
+		{
+			break;
+		}
+	}
+	Py_END_ALLOW_THREADS
+
+	PyMem_Free(
+	 buffer );
+
+	if( read_count <= -1 )
+	{
+		pyqcow_error_raise(
+		 error,
+		 PyExc_IOError,
+		 "%s: unable to read data.",
+		 function );
+
+		libcerror_error_free(
+		 &error );
+
+		return( NULL );
+	}
+	integer_object = pyqcow_integer_unsigned_new_from_64bit(
+	                  (uint64_t) total_read_count );
+
+	return( integer_object );
+}
+
 /* Seeks a certain offset in the data
  * Returns a Python object if successful or NULL on error
  */
@@ -1240,6 +1986,55 @@ PyObject *pyqcow_file_get_offset(
 	return( integer_object );
 }
 
+/* Flushes the cached data
+ * Returns a Python object if successful or NULL on error
+ */
+PyObject *pyqcow_file_flush_cache(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments PYQCOW_ATTRIBUTE_UNUSED )
+{
+	libcerror_error_t *error = NULL;
+	static char *function    = "pyqcow_file_flush_cache";
+	int result               = 0;
+
+	PYQCOW_UNREFERENCED_PARAMETER( arguments )
+
+	if( pyqcow_file == NULL )
+	{
+		PyErr_Format(
+		 PyExc_TypeError,
+		 "%s: invalid file.",
+		 function );
+
+		return( NULL );
+	}
+	Py_BEGIN_ALLOW_THREADS
+
+	result = libqcow_file_flush_cache(
+	          pyqcow_file->file,
+	          &error );
+
+	Py_END_ALLOW_THREADS
+
+	if( result != 1 )
+	{
+		pyqcow_error_raise(
+		 error,
+		 PyExc_IOError,
+		 "%s: unable to flush cache.",
+		 function );
+
+		libcerror_error_free(
+		 &error );
+
+		return( NULL );
+	}
+	Py_IncRef(
+	 Py_None );
+
+	return( Py_None );
+}
+
 /* Retrieves the media size
  * Returns a Python object if successful or NULL on error
  */
@@ -95,11 +95,31 @@ PyObject *pyqcow_file_read_buffer(
            PyObject *arguments,
            PyObject *keywords );
 
+PyObject *pyqcow_file_read_buffer_into(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords );
+
 PyObject *pyqcow_file_read_buffer_at_offset(
            pyqcow_file_t *pyqcow_file,
            PyObject *arguments,
            PyObject *keywords );
 
+PyObject *pyqcow_file_read_buffer_at_offset_into(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords );
+
+PyObject *pyqcow_file_read_buffers_at_offsets(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords );
+
+PyObject *pyqcow_file_consume_range(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments,
+           PyObject *keywords );
+
 PyObject *pyqcow_file_seek_offset(
            pyqcow_file_t *pyqcow_file,
            PyObject *arguments,
@@ -109,6 +129,10 @@ PyObject *pyqcow_file_get_offset(
            pyqcow_file_t *pyqcow_file,
            PyObject *arguments );
 
+PyObject *pyqcow_file_flush_cache(
+           pyqcow_file_t *pyqcow_file,
+           PyObject *arguments );
+
 PyObject *pyqcow_file_get_media_size(
            pyqcow_file_t *pyqcow_file,
            PyObject *arguments );
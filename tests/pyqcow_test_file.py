@@ -176,6 +176,40 @@ class FileTypeTests(unittest.TestCase):
 
     qcow_file.close()
 
+  def test_read_buffer_into(self):
+    """Tests the read_buffer_into function."""
+    if not unittest.source:
+      return
+
+    qcow_file = pyqcow.file()
+
+    qcow_file.open(unittest.source)
+
+    file_size = qcow_file.get_media_size()
+
+    # Test normal read.
+    data = bytearray(4096)
+    read_count = qcow_file.read_buffer_into(data)
+
+    self.assertEqual(read_count, min(file_size, 4096))
+
+    # Test read beyond file size.
+    if file_size > 16:
+      qcow_file.seek_offset(-16, os.SEEK_END)
+
+      read_count = qcow_file.read_buffer_into(data)
+
+      self.assertEqual(read_count, 16)
+
+    with self.assertRaises(TypeError):
+      qcow_file.read_buffer_into(None)
+
+    qcow_file.close()
+
+    # Test the read without open.
+    with self.assertRaises(IOError):
+      qcow_file.read_buffer_into(data)
+
   def test_read_buffer_at_offset(self):
     """Tests the read_buffer_at_offset function."""
     if not unittest.source:
@@ -212,6 +246,154 @@ class FileTypeTests(unittest.TestCase):
     with self.assertRaises(IOError):
       qcow_file.read_buffer_at_offset(4096, 0)
 
+  def test_read_buffer_at_offset_into(self):
+    """Tests the read_buffer_at_offset_into function."""
+    if not unittest.source:
+      return
+
+    qcow_file = pyqcow.file()
+
+    qcow_file.open(unittest.source)
+
+    file_size = qcow_file.get_media_size()
+
+    # Test normal read.
+    data = bytearray(4096)
+    read_count = qcow_file.read_buffer_at_offset_into(data, 0)
+
+    self.assertEqual(read_count, min(file_size, 4096))
+
+    # Test read beyond file size.
+    if file_size > 16:
+      read_count = qcow_file.read_buffer_at_offset_into(data, file_size - 16)
+
+      self.assertEqual(read_count, 16)
+
+    with self.assertRaises(TypeError):
+      qcow_file.read_buffer_at_offset_into(None, 0)
+
+    with self.assertRaises(ValueError):
+      qcow_file.read_buffer_at_offset_into(data, -1)
+
+    qcow_file.close()
+
+    # Test the read without open.
+    with self.assertRaises(IOError):
+      qcow_file.read_buffer_at_offset_into(data, 0)
+
+  def test_read_buffers_at_offsets(self):
+    """Tests the read_buffers_at_offsets function."""
+    if not unittest.source:
+      return
+
+    qcow_file = pyqcow.file()
+
+    qcow_file.open(unittest.source)
+
+    file_size = qcow_file.get_media_size()
+
+    # Test normal read.
+    data_list = qcow_file.read_buffers_at_offsets([4096, 4096], [0, 0])
+
+    self.assertIsNotNone(data_list)
+    self.assertEqual(len(data_list), 2)
+    self.assertEqual(len(data_list[0]), min(file_size, 4096))
+    self.assertEqual(data_list[0], data_list[1])
+
+    data_list = qcow_file.read_buffers_at_offsets([], [])
+
+    self.assertEqual(data_list, [])
+
+    # Test read beyond file size.
+    if file_size > 16:
+      data_list = qcow_file.read_buffers_at_offsets(
+          [4096], [file_size - 16])
+
+      self.assertIsNotNone(data_list)
+      self.assertEqual(len(data_list[0]), 16)
+
+    with self.assertRaises(ValueError):
+      qcow_file.read_buffers_at_offsets([4096], [0, 4096])
+
+    with self.assertRaises(ValueError):
+      qcow_file.read_buffers_at_offsets([-1], [0])
+
+    with self.assertRaises(ValueError):
+      qcow_file.read_buffers_at_offsets([4096], [-1])
+
+    qcow_file.close()
+
+    # Test the read without open.
+    with self.assertRaises(IOError):
+      qcow_file.read_buffers_at_offsets([4096], [0])
+
+  def test_consume_range(self):
+    """Tests the consume_range function."""
+    if not unittest.source:
+      return
+
+    qcow_file = pyqcow.file()
+
+    qcow_file.open(unittest.source)
+
+    file_size = qcow_file.get_media_size()
+
+    # Test normal read.
+    read_count = qcow_file.consume_range(0, file_size)
+
+    self.assertEqual(read_count, file_size)
+
+    # Test read beyond file size.
+    if file_size > 16:
+      read_count = qcow_file.consume_range(file_size - 16, 4096)
+
+      self.assertEqual(read_count, 16)
+
+    # Test read from the current offset.
+    if file_size > 16:
+      qcow_file.seek_offset(file_size - 16, os.SEEK_SET)
+
+      read_count = qcow_file.consume_range(None, 4096)
+
+      self.assertEqual(read_count, 16)
+      self.assertEqual(qcow_file.get_offset(), file_size)
+
+    with self.assertRaises(ValueError):
+      qcow_file.consume_range(-1, 4096)
+
+    with self.assertRaises(ValueError):
+      qcow_file.consume_range(0, -1)
+
+    qcow_file.close()
+
+    # Test the read without open.
+    with self.assertRaises(IOError):
+      qcow_file.consume_range(0, 4096)
+
+  def test_flush_cache(self):
+    """Tests the flush_cache function."""
+    if not unittest.source:
+      return
+
+    qcow_file = pyqcow.file()
+
+    qcow_file.open(unittest.source)
+
+    data = qcow_file.read_buffer_at_offset(4096, 0)
+
+    qcow_file.flush_cache()
+
+    # Test read after flush.
+    flushed_data = qcow_file.read_buffer_at_offset(4096, 0)
+
+    self.assertEqual(flushed_data, data)
+
+    qcow_file.close()
+
+    # Test the flush without open.
+    with self.assertRaises(IOError):
+      qcow_file.flush_cache()
+
   def test_seek_offset(self):
     """Tests the seek_offset function."""
     if not unittest.source:
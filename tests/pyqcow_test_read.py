@@ -21,23 +21,206 @@
 
 from __future__ import print_function
 import argparse
+import collections
+import mmap
 import os
 import sys
+import threading
+import time
+
+try:
+  import queue
+except ImportError:
+  import Queue as queue
 
 import pyqcow
 
 
-def get_whence_string(whence):
-  """Retrieves a human readable string representation of the whence."""
-  if whence == os.SEEK_CUR:
-    whence_string = "SEEK_CUR"
-  elif whence == os.SEEK_END:
-    whence_string = "SEEK_END"
-  elif whence == os.SEEK_SET:
-    whence_string = "SEEK_SET"
+# Read in chunks of 2 MiB, which is a multiple of the default QCOW cluster
+# size of 64 KiB.
+BUFFER_SIZE = 2 * 1024 * 1024
+
+# Maximum number of buffers read by a single read_buffers_at_offsets call.
+MAXIMUM_NUMBER_OF_BUFFERS = 16
+
+# Human readable string representations of the whence values.
+WHENCE_STRINGS = {
+    os.SEEK_CUR: "SEEK_CUR",
+    os.SEEK_END: "SEEK_END",
+    os.SEEK_SET: "SEEK_SET"}
+
+# The result of a test, where the duration is in seconds.
+TestResult = collections.namedtuple(
+    "TestResult", ["description", "result", "error_string", "duration"])
+
+# time.perf_counter is not available in Python 2.
+get_time = getattr(time, "perf_counter", time.time)
+
+
+class ReadAheadThread(threading.Thread):
+  """Thread that reads buffers at specific offsets ahead of their use."""
+
+  def __init__(self, qcow_file):
+    """Initializes the thread."""
+    super(ReadAheadThread, self).__init__()
+    self._qcow_file = qcow_file
+    self._read_queue = queue.Queue()
+    self._result_queue = queue.Queue()
+    self.daemon = True
+
+  def run(self):
+    """Reads the queued buffers until stopped."""
+    while True:
+      read_request = self._read_queue.get()
+      if read_request is None:
+        break
+
+      buffer_view, read_offset = read_request
+      try:
+        read_count = self._qcow_file.read_buffer_at_offset_into(
+            buffer_view, read_offset)
+        self._result_queue.put((read_count, None))
+      except Exception as exception:
+        self._result_queue.put((None, exception))
+
+  def get_read_count(self):
+    """Waits for the oldest queued read to complete and retrieves its count."""
+    read_count, exception = self._result_queue.get()
+    if exception:
+      raise exception
+    return read_count
+
+  def queue_read(self, buffer_view, read_offset):
+    """Queues reading a buffer at a specific offset."""
+    self._read_queue.put((buffer_view, read_offset))
+
+  def stop(self):
+    """Stops the thread after the queued reads have completed."""
+    self._read_queue.put(None)
+    self.join()
+
+
+class TestThread(threading.Thread):
+  """Thread that runs a test on its own file."""
+
+  def __init__(self, open_function, filename, test_function, test_arguments):
+    """Initializes the thread."""
+    super(TestThread, self).__init__()
+    self._filename = filename
+    self._open_function = open_function
+    self._test_arguments = test_arguments
+    self._test_function = test_function
+    self.exception = None
+    self.test_result = None
+
+  def run(self):
+    """Opens the file and runs the test."""
+    try:
+      qcow_file, file_objects = self._open_function(self._filename)
+      try:
+        self.test_result = self._test_function(
+            qcow_file, *self._test_arguments)
+      finally:
+        close_file(qcow_file, file_objects)
+
+    except Exception as exception:
+      self.exception = exception
+
+
+def get_test_result_lines(test_result):
+  """Retrieves the lines of output that represent the result of a test."""
+  if not test_result.result:
+    result_string = "FAIL"
   else:
-    whence_string = "UNKNOWN"
-  return whence_string
+    result_string = "PASS"
+
+  lines = ["{0:s}({1:s})\t{2:.3f} seconds\n".format(
+      test_result.description, result_string, test_result.duration)]
+
+  if test_result.error_string:
+    lines.append("{0:s}\n".format(test_result.error_string))
+  return lines
+
+
+def advise_access_pattern(file_descriptor, is_sequential):
+  """Advises the kernel about the access pattern of a file descriptor."""
+  if hasattr(os, "posix_fadvise"):
+    if is_sequential:
+      advice = os.POSIX_FADV_SEQUENTIAL
+    else:
+      advice = os.POSIX_FADV_NORMAL
+
+    os.posix_fadvise(file_descriptor, 0, 0, advice)
+
+
+def advise_file(filename, advice):
+  """Advises the kernel about the cached data of a file."""
+  # Dropping data from the page cache applies to all file descriptors of
+  # the file, including the one used by libqcow. Access pattern advice only
+  # applies to the file descriptor it is given, see advise_access_pattern.
+  file_descriptor = os.open(filename, os.O_RDONLY)
+  try:
+    os.posix_fadvise(file_descriptor, 0, 0, advice)
+  finally:
+    os.close(file_descriptor)
+
+
+def drop_caches(qcow_file, filename, mmap_object=None):
+  """Drops the cached data of the file and of the image file."""
+  qcow_file.flush_cache()
+
+  # Pages that are still mapped are not dropped from the page cache, hence
+  # they are unmapped first. mmap.madvise is not available before Python 3.8.
+  if mmap_object is not None and hasattr(mmap_object, "madvise"):
+    mmap_object.madvise(mmap.MADV_DONTNEED)
+
+  if hasattr(os, "posix_fadvise"):
+    advise_file(filename, os.POSIX_FADV_DONTNEED)
+
+
+def open_file(filename):
+  """Opens a file and returns it with the file objects it uses."""
+  qcow_file = pyqcow.file()
+  qcow_file.open(filename, "r")
+
+  return qcow_file, []
+
+
+def open_file_object(filename):
+  """Opens a file using a file-like object."""
+  # Use an unbuffered file object since libqcow already caches the data it
+  # reads, buffering in the file object only adds another copy.
+  file_object = open(filename, "rb", buffering=0)
+
+  qcow_file = pyqcow.file()
+  qcow_file.open_file_object(file_object, "r")
+
+  return qcow_file, [file_object]
+
+
+def open_file_mmap(filename):
+  """Opens a file using a memory-mapped file."""
+  file_object = open(filename, "rb")
+
+  # A memory-mapped file provides the read, seek and tell methods used by
+  # open_file_object. Every read of the file-like object IO handle calls the
+  # read method of the mapping, which copies the data into a new string, so
+  # this is not faster than reading the file.
+  mmap_object = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+  qcow_file = pyqcow.file()
+  qcow_file.open_file_object(mmap_object, "r")
+
+  return qcow_file, [mmap_object, file_object]
+
+
+def close_file(qcow_file, file_objects):
+  """Closes a file and the file objects it uses."""
+  qcow_file.close()
+
+  # Closing the file does not close the file objects it uses.
+  for file_object in file_objects:
+    file_object.close()
 
 
 def pyqcow_test_seek_offset_and_read_buffer(
@@ -46,51 +229,91 @@ def pyqcow_test_seek_offset_and_read_buffer(
   """Tests seeking an offset and reading a buffer."""
   description = (
       "Testing reading buffer at offset: {0:d}, whence: {1:s} of size: {2:d}"
-      "\t").format(input_offset, get_whence_string(input_whence), input_size)
-  print(description, end="")
+      "\t").format(
+          input_offset, WHENCE_STRINGS.get(input_whence, "UNKNOWN"),
+          input_size)
+
+  start_time = get_time()
 
   error_string = None
   result = True
   try:
     qcow_file.seek(input_offset, input_whence)
 
+    # The checks are asserts so that they are skipped when the test is run
+    # with python -O to only measure reading.
     result_offset = qcow_file.get_offset()
-    if expected_offset != result_offset:
+    assert result_offset == expected_offset, (
+        "Unexpected offset: {0:d}".format(result_offset))
+
+    result_size = qcow_file.consume_range(None, input_size)
+    assert result_size == expected_size, (
+        "Unexpected read count: {0:d}".format(result_size))
+
+  except AssertionError as exception:
+    error_string = str(exception)
+    result = False
+
+  except Exception as exception:
+    error_string = str(exception)
+    if expected_offset != -1:
       result = False
 
-    if result:
-      result_size = 0
-      while input_size > 0:
-        read_size = 4096
-        if input_size < read_size:
-          read_size = input_size
+  return TestResult(
+      description, result, error_string, get_time() - start_time)
 
-        data = qcow_file.read(size=read_size)
-        data_size = len(data)
 
-        input_size -= data_size
-        result_size += data_size
+def pyqcow_test_seek_offset_and_read_buffer_into(
+    qcow_file, input_offset, input_whence, input_size,
+    expected_offset, expected_size):
+  """Tests seeking an offset and reading into a buffer."""
+  description = (
+      "Testing reading into buffer at offset: {0:d}, whence: {1:s} of size: "
+      "{2:d}\t").format(
+          input_offset, WHENCE_STRINGS.get(input_whence, "UNKNOWN"),
+          input_size)
 
-        if data_size != read_size:
-          break
+  start_time = get_time()
 
-      if result_size != expected_size:
-        error_string = "Unexpected read count: {0:d}".format(result_size)
-        result = False
+  error_string = None
+  result = True
+  try:
+    qcow_file.seek(input_offset, input_whence)
+
+    result_offset = qcow_file.get_offset()
+    assert result_offset == expected_offset, (
+        "Unexpected offset: {0:d}".format(result_offset))
+
+    # Read from the current offset into the same buffer, a short read
+    # indicates the end of the data.
+    buffer_view = memoryview(bytearray(BUFFER_SIZE))
+
+    remaining_size = input_size
+    result_size = 0
+    while remaining_size > 0:
+      read_size = min(remaining_size, BUFFER_SIZE)
+      read_count = qcow_file.readinto(buffer_view[:read_size])
+
+      remaining_size -= read_count
+      result_size += read_count
+
+      if read_count < read_size:
+        break
+
+    assert result_size == expected_size, (
+        "Unexpected read count: {0:d}".format(result_size))
+
+  except AssertionError as exception:
+    error_string = str(exception)
+    result = False
 
   except Exception as exception:
     error_string = str(exception)
     if expected_offset != -1:
       result = False
 
-  if not result:
-    print("(FAIL)")
-  else:
-    print("(PASS)")
-
-  if error_string:
-    print(error_string)
-  return result
+  return TestResult(
+      description, result, error_string, get_time() - start_time)
 
 
 def pyqcow_test_read_buffer_at_offset(
@@ -100,159 +323,315 @@ def pyqcow_test_read_buffer_at_offset(
   description = (
       "Testing reading buffer at offset: {0:d} and size: {1:d}"
       "\t").format(input_offset, input_size)
-  print(description, end="")
+
+  start_time = get_time()
 
   error_string = None
   result = True
   try:
-    result_size = 0
-    while input_size > 0:
-      read_size = 4096
-      if input_size < read_size:
-        read_size = input_size
+    # Alternate between 2 buffers, one that is being read into and one that
+    # is being handled.
+    buffer_views = [
+        memoryview(bytearray(BUFFER_SIZE)), memoryview(bytearray(BUFFER_SIZE))]
+    buffer_index = 0
+
+    # The reads are bounded by the range, a short read is detected by
+    # the checks after the loop.
+    range_end_offset = input_offset + input_size
+    read_offset = input_offset
+
+    # A single thread reads all the buffers, so that no thread is created
+    # per buffer.
+    read_ahead_thread = ReadAheadThread(qcow_file)
+    read_ahead_thread.start()
+
+    try:
+      number_of_queued_reads = 0
+      if input_size > 0:
+        read_size = min(input_size, BUFFER_SIZE)
+        read_ahead_thread.queue_read(
+            buffer_views[buffer_index][:read_size], read_offset)
+        number_of_queued_reads += 1
+        read_offset += read_size
 
-      data = qcow_file.read_buffer_at_offset(read_size, input_offset)
-      data_size = len(data)
+      result_size = 0
+      while number_of_queued_reads > 0:
+        data_size = read_ahead_thread.get_read_count()
+        number_of_queued_reads -= 1
+
+        # Start reading the next buffer before the current one is handled.
+        buffer_index = 1 - buffer_index
+        read_size = min(range_end_offset - read_offset, BUFFER_SIZE)
+        if read_size > 0:
+          read_ahead_thread.queue_read(
+              buffer_views[buffer_index][:read_size], read_offset)
+          number_of_queued_reads += 1
+          read_offset += read_size
 
-      input_offset += data_size
-      input_size -= data_size
-      result_size += data_size
+        result_size += data_size
 
-      if data_size != read_size:
-        break
+    finally:
+      read_ahead_thread.stop()
 
-    if input_offset != expected_offset:
-      error_string = "Unexpected offset: {0:d}".format(input_offset)
-      result = False
+    input_offset += result_size
 
-    elif result_size != expected_size:
-      error_string = "Unexpected read count: {0:d}".format(result_size)
-      result = False
+    assert input_offset == expected_offset, (
+        "Unexpected offset: {0:d}".format(input_offset))
+    assert result_size == expected_size, (
+        "Unexpected read count: {0:d}".format(result_size))
+
+  except AssertionError as exception:
+    error_string = str(exception)
+    result = False
 
   except Exception as exception:
     error_string = str(exception)
     if expected_offset != -1:
       result = False
 
-  if not result:
-    print("(FAIL)")
-  else:
-    print("(PASS)")
+  return TestResult(
+      description, result, error_string, get_time() - start_time)
 
-  if error_string:
-    print(error_string)
-  return result
 
+def pyqcow_test_read_buffers_at_offsets(
+    qcow_file, input_offset, input_size,
+    expected_offset, expected_size):
+  """Tests reading multiple buffers at specific offsets."""
+  description = (
+      "Testing reading buffers at offset: {0:d} and size: {1:d}"
+      "\t").format(input_offset, input_size)
 
-def pyqcow_test_read(qcow_file):
-  """Tests the read function."""
-  file_size = qcow_file.media_size
+  start_time = get_time()
 
-  # Case 0: test full read
+  error_string = None
+  result = True
+  try:
+    range_end_offset = input_offset + input_size
+    read_offset = input_offset
+
+    result_size = 0
+    while read_offset < range_end_offset:
+      batch_end_offset = min(
+          read_offset + (MAXIMUM_NUMBER_OF_BUFFERS * BUFFER_SIZE),
+          range_end_offset)
+
+      # Let range determine the offsets of the batch instead of an interpreted
+      # loop. Only the last buffer of the batch can be smaller than the buffer
+      # size.
+      read_offsets = list(range(read_offset, batch_end_offset, BUFFER_SIZE))
+      read_sizes = [BUFFER_SIZE] * len(read_offsets)
+      read_sizes[-1] = batch_end_offset - read_offsets[-1]
+
+      data_size = sum([
+          len(data) for data in qcow_file.read_buffers_at_offsets(
+              read_sizes, read_offsets)])
+
+      read_offset = batch_end_offset
+      result_size += data_size
 
-  # Test: offset: 0 size: <file_size>
-  # Expected result: offset: 0 size: <file_size>
-  read_offset = 0
-  read_size = file_size
+    input_offset += result_size
 
-  if not pyqcow_test_seek_offset_and_read_buffer(
-      qcow_file, read_offset, os.SEEK_SET, read_size,
-      read_offset, read_size):
-    return False
+    assert input_offset == expected_offset, (
+        "Unexpected offset: {0:d}".format(input_offset))
+    assert result_size == expected_size, (
+        "Unexpected read count: {0:d}".format(result_size))
 
-  if not pyqcow_test_seek_offset_and_read_buffer(
-      qcow_file, read_offset, os.SEEK_SET, read_size,
-      read_offset, read_size):
-    return False
+  except AssertionError as exception:
+    error_string = str(exception)
+    result = False
+
+  except Exception as exception:
+    error_string = str(exception)
+    if expected_offset != -1:
+      result = False
+
+  return TestResult(
+      description, result, error_string, get_time() - start_time)
+
+
+def pyqcow_test_read(
+    qcow_file, filename, open_function, file_descriptor=None,
+    mmap_object=None, random_access_only=False):
+  """Tests the read function."""
+  file_size = qcow_file.media_size
+
+  # Tests are defined as (test function, test arguments), where the test
+  # function is called with the file followed by the test arguments. The seek
+  # tests depend on the current offset of the file and the read at offset
+  # tests do not. The full read tests read the entire media sequentially.
+  # Every case is tested with 2 different read functions.
+  seek_tests = []
+  full_read_tests = []
+  read_at_offset_tests = []
+
+  # Case 0 and Case 2 are skipped when only the random access cases, Case 1
+  # and Case 3, are tested.
+  if not random_access_only:
+    # Case 0: test full read
+
+    # Test: offset: 0 size: <file_size>
+    # Expected result: offset: <file_size> size: <file_size>
+    read_offset = 0
+    read_size = file_size
+
+    full_read_tests.append((
+        pyqcow_test_read_buffers_at_offsets, (
+            read_offset, read_size,
+            read_offset + read_size, read_size)))
+
+    full_read_tests.append((
+        pyqcow_test_read_buffer_at_offset, (
+            read_offset, read_size,
+            read_offset + read_size, read_size)))
 
   # Case 1: test buffer at offset read
 
   # Test: offset: <file_size / 7> size: <file_size / 2>
   # Expected result: offset: <file_size / 7> size: <file_size / 2>
-  read_offset, _ = divmod(file_size, 7)
-  read_size, _ = divmod(file_size, 2)
-
-  if not pyqcow_test_seek_offset_and_read_buffer(
-      qcow_file, read_offset, os.SEEK_SET, read_size,
-      read_offset, read_size):
-    return False
-
-  if not pyqcow_test_seek_offset_and_read_buffer(
-      qcow_file, read_offset, os.SEEK_SET, read_size,
-      read_offset, read_size):
-    return False
+  read_offset = file_size // 7
+  read_size = file_size // 2
 
-  # Case 2: test read beyond media size
+  seek_tests.append((
+      pyqcow_test_seek_offset_and_read_buffer, (
+          read_offset, os.SEEK_SET, read_size,
+          read_offset, read_size)))
 
-  if file_size < 1024:
-    # Test: offset: <file_size - 1024> size: 4096
-    # Expected result: offset: -1 size: <undetermined>
-    read_offset = file_size - 1024
-    read_size = 4096
+  # Test: offset: <file_size / 7> size: <file_size / 2>
+  # Expected result: offset: <file_size / 7> size: <file_size / 2>
+  seek_tests.append((
+      pyqcow_test_seek_offset_and_read_buffer_into, (
+          read_offset, os.SEEK_SET, read_size,
+          read_offset, read_size)))
+
+  if not random_access_only:
+    # Case 2: test read beyond media size
+
+    if file_size < 1024:
+      # Test: offset: <file_size - 1024> size: 4096
+      # Expected result: offset: -1 size: <undetermined>
+      read_offset = file_size - 1024
+      read_size = 4096
 
-    if not pyqcow_test_seek_offset_and_read_buffer(
-        qcow_file, read_offset, os.SEEK_SET, read_size, -1, -1):
-      return False
+      seek_tests.append((
+          pyqcow_test_seek_offset_and_read_buffer, (
+              read_offset, os.SEEK_SET, read_size, -1, -1)))
 
-    if not pyqcow_test_seek_offset_and_read_buffer(
-        qcow_file, read_offset, os.SEEK_SET, read_size, -1, -1):
-      return False
+      read_at_offset_tests.append((
+          pyqcow_test_read_buffer_at_offset, (
+              read_offset, read_size, -1, -1)))
 
-  else:
-    # Test: offset: <file_size - 1024> size: 4096
-    # Expected result: offset: <file_size - 1024> size: 1024
-    read_offset = file_size - 1024
-    read_size = 4096
+    else:
+      # Test: offset: <file_size - 1024> size: 4096
+      # Expected result: offset: <file_size - 1024> size: 1024
+      read_offset = file_size - 1024
+      read_size = 4096
 
-    if not pyqcow_test_seek_offset_and_read_buffer(
-        qcow_file, read_offset, os.SEEK_SET, read_size,
-        read_offset, 1024):
-      return False
+      seek_tests.append((
+          pyqcow_test_seek_offset_and_read_buffer, (
+              read_offset, os.SEEK_SET, read_size,
+              read_offset, 1024)))
 
-    if not pyqcow_test_seek_offset_and_read_buffer(
-        qcow_file, read_offset, os.SEEK_SET, read_size,
-        read_offset, 1024):
-      return False
+      # Test: offset: <file_size - 1024> size: 4096
+      # Expected result: offset: <file_size> size: 1024
+      read_at_offset_tests.append((
+          pyqcow_test_read_buffer_at_offset, (
+              read_offset, read_size, file_size, 1024)))
 
   # Case 3: test buffer at offset read
 
   # Test: offset: <file_size / 7> size: <file_size / 2>
   # Expected result: offset: < ( file_size / 7 ) + ( file_size / 2 ) > size: <file_size / 2>
-  read_offset, _ = divmod(file_size, 7)
-  read_size, _ = divmod(file_size, 2)
-
-  if not pyqcow_test_read_buffer_at_offset(
-      qcow_file, read_offset, read_size,
-      read_offset + read_size, read_size):
-    return False
-
-  if not pyqcow_test_read_buffer_at_offset(
-      qcow_file, read_offset, read_size,
-      read_offset + read_size, read_size):
-    return False
-
-  return True
+  read_offset = file_size // 7
+  read_size = file_size // 2
+
+  read_at_offset_tests.append((
+      pyqcow_test_read_buffer_at_offset, (
+          read_offset, read_size,
+          read_offset + read_size, read_size)))
+
+  read_at_offset_tests.append((
+      pyqcow_test_read_buffers_at_offsets, (
+          read_offset, read_size,
+          read_offset + read_size, read_size)))
+
+  # The seek and full read tests are run sequentially on the file.
+  # The caches are dropped before every one of these tests, so that a test
+  # reads data that has not been cached by a previous test. For
+  # a memory-mapped image file this requires mmap.madvise, without it the
+  # data stays cached.
+  # Kernel readahead is only advised for the full read tests, the other tests
+  # start reading in the middle of the media.
+  test_groups = [
+      (seek_tests, False),
+      (full_read_tests, True)]
+
+  test_results = []
+  for tests, is_sequential in test_groups:
+    for test_function, test_arguments in tests:
+      drop_caches(qcow_file, filename, mmap_object=mmap_object)
+      if file_descriptor is not None:
+        advise_access_pattern(file_descriptor, is_sequential)
+
+      test_results.append(test_function(qcow_file, *test_arguments))
+
+  # The read at offset tests are run in parallel, where every test opens its
+  # own file, since libqcow only protects a file against concurrent access
+  # when built with multi-thread support. The files start with empty libqcow
+  # caches, but the tests share the page cache of the image file while they
+  # run. The durations of these tests include waiting for each other.
+  drop_caches(qcow_file, filename, mmap_object=mmap_object)
+
+  test_threads = []
+  for test_function, test_arguments in read_at_offset_tests:
+    test_thread = TestThread(
+        open_function, filename, test_function, test_arguments)
+    test_thread.start()
+    test_threads.append(test_thread)
+
+  for test_thread in test_threads:
+    test_thread.join()
+
+  for test_thread in test_threads:
+    if test_thread.exception:
+      raise test_thread.exception
+    test_results.append(test_thread.test_result)
+
+  return test_results
 
 
 def pyqcow_test_read_file(filename):
   """Tests the read function with a file."""
-  qcow_file = pyqcow.file()
-
-  qcow_file.open(filename, "r")
-  result = pyqcow_test_read(qcow_file)
-  qcow_file.close()
+  qcow_file, file_objects = open_file(filename)
+  result = pyqcow_test_read(qcow_file, filename, open_file)
+  close_file(qcow_file, file_objects)
 
   return result
 
 
 def pyqcow_test_read_file_object(filename):
   """Tests the read function with a file-like object."""
-  file_object = open(filename, "rb")
-  qcow_file = pyqcow.file()
+  qcow_file, file_objects = open_file_object(filename)
 
-  qcow_file.open_file_object(file_object, "r")
-  result = pyqcow_test_read(qcow_file)
-  qcow_file.close()
+  # libqcow reads the image file through the file descriptor of the file
+  # object, hence access pattern advice can be given for it.
+  result = pyqcow_test_read(
+      qcow_file, filename, open_file_object,
+      file_descriptor=file_objects[0].fileno())
+  close_file(qcow_file, file_objects)
+
+  return result
+
+
+def pyqcow_test_read_file_mmap(filename):
+  """Tests the read function with a memory-mapped file."""
+  qcow_file, file_objects = open_file_mmap(filename)
+
+  # Only the random access cases are tested to cover open_file_object with
+  # a memory-mapped file.
+  result = pyqcow_test_read(
+      qcow_file, filename, open_file_mmap, mmap_object=file_objects[0],
+      random_access_only=True)
+  close_file(qcow_file, file_objects)
 
   return result
 
@@ -260,7 +639,7 @@ def pyqcow_test_read_file_object(filename):
 def pyqcow_test_read_file_no_open(filename):
   """Tests the read function with a file without open."""
   description = "Testing read of without open:\t"
-  print(description, end="")
+  start_time = get_time()
 
   qcow_file = pyqcow.file()
 
@@ -272,14 +651,8 @@ def pyqcow_test_read_file_no_open(filename):
     error_string = str(exception)
     result = True
 
-  if not result:
-    print("(FAIL)")
-  else:
-    print("(PASS)")
-
-  if error_string:
-    print(error_string)
-  return result
+  return [TestResult(
+      description, result, error_string, get_time() - start_time)]
 
 
 def main():
@@ -299,16 +672,30 @@ def main():
     print("")
     return False
 
-  if not pyqcow_test_read_file(options.source):
-    return False
+  test_functions = [
+      pyqcow_test_read_file,
+      pyqcow_test_read_file_object,
+      pyqcow_test_read_file_mmap,
+      pyqcow_test_read_file_no_open]
 
-  if not pyqcow_test_read_file_object(options.source):
-    return False
+  # Write the output of the tests per test function, instead of per test,
+  # so that the output of the previous test functions is kept when a test
+  # function fails with an exception.
+  result = True
+  for test_function in test_functions:
+    output_lines = []
+    for test_result in test_function(options.source):
+      output_lines.extend(get_test_result_lines(test_result))
+      if not test_result.result:
+        result = False
 
-  if not pyqcow_test_read_file_no_open(options.source):
-    return False
+    sys.stdout.writelines(output_lines)
+    sys.stdout.flush()
 
-  return True
+    if not result:
+      break
+
+  return result
 
 
 if __name__ == "__main__":
@@ -1691,6 +1691,59 @@ on_error:
 	return( 0 );
 }
 
+/* Tests the libqcow_file_flush_cache function
+ * Returns 1 if successful or 0 if not
+ */
+int qcow_test_file_flush_cache(
+     libqcow_file_t *file )
+{
+	libcerror_error_t *error = NULL;
+	int result               = 0;
+
+	/* Test regular cases
+	 */
+	result = libqcow_file_flush_cache(
+	          file,
+	          &error );
+
+	QCOW_TEST_ASSERT_EQUAL_INT(
+	 "result",
+	 result,
+	 1 );
+
+	QCOW_TEST_ASSERT_IS_NULL(
+	 "error",
+	 error );
+
+	/* Test error cases
+	 */
+	result = libqcow_file_flush_cache(
+	          NULL,
+	          &error );
+
+	QCOW_TEST_ASSERT_EQUAL_INT(
+	 "result",
+	 result,
+	 -1 );
+
+	QCOW_TEST_ASSERT_IS_NOT_NULL(
+	 "error",
+	 error );
+
+	libcerror_error_free(
+	 &error );
+
+	return( 1 );
+
+on_error:
+	if( error != NULL )
+	{
+		libcerror_error_free(
+		 &error );
+	}
+	return( 0 );
+}
+
 /* Tests the libqcow_file_get_media_size function
  * Returns 1 if successful or 0 if not
  */
@@ -2058,6 +2111,11 @@ int main(
 		 qcow_test_file_get_offset,
 		 file );
 
+		QCOW_TEST_RUN_WITH_ARGS(
+		 "libqcow_file_flush_cache",
+		 qcow_test_file_flush_cache,
+		 file );
+
 		/* TODO: add tests for libqcow_file_set_keys */
 
 		/* TODO: add tests for libqcow_file_set_utf8_password */